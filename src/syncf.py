@@ -7,21 +7,20 @@
 # GoerTek
 # All rights reserved.
 import argparse
-from os.path import realpath
-import pathlib
 import sys
 import os
-from rich.jupyter import display
+import stat
+import io
+import time
+from functools import lru_cache
+from contextlib import contextmanager
+from typing import IO, cast
 from pathlib import Path
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeRemainingColumn
-from datetime import datetime
-import inquirer
-from pathspec import PathSpec
-from pathspec.patterns.gitwildmatch import GitWildMatchPattern
-import tarfile
-
-console = Console()
+from datetime import datetime, timedelta
+
+# rich, pathspec and tarfile are imported where they are used,
+# so `syncf -h` and friends don't pay for them at startup
+
 is_frozen = getattr(sys, 'frozen', False)
 
 if is_frozen:
@@ -33,306 +32,722 @@ else:
     root_path = Path(__file__).resolve().parent.parent
 
 package_dir = Path(root_path / ".files").resolve()
+package_suffixes = (".tar.gz", ".tar.zst")
+scan_cache_dir = package_dir / ".cache"
+
+# already-compressed formats, recompressing them costs cpu for almost no gain
+incompressible_suffixes = {
+    '.jpg', '.jpeg', '.png', '.webp', '.mp3', '.mp4', '.mkv',
+    '.zip', '.gz', '.xz', '.zst', '.whl', '.jar', '.so',
+}
+
+banner = """
+         ::::::::::  ##::    ::## ##::   ::##  :::::::::: :::::::::::: 
+        ::::::::::::  ##::  ::##  ###::  ::## :::::::::::: :::::::::::: 
+        ::::::         ########   ####:: ::## ::::::       ::::::       
+         ::::::::::     ######    ## ::####:: ::::::       ::::::::::   
+             :::::::     ####     ##  ::###:: ::::::       ::::::::::   
+        ::::::::::::     ####     ##   ::##:: :::::::::::: ::::::       
+         ::::::::::      ####     ##    ::##   :::::::::: ::::::       
+
+    """
+
+
+@lru_cache(maxsize=None)
+def _console():
+    from rich.console import Console
+    return Console()
 
 
 
 def format_size(size_in_bytes):
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_in_bytes < 1024.0 or unit == 'GB':
-            return f"{size_in_bytes:6.2f} {unit}"
-        size_in_bytes /= 1024.0
-    return f"{size_in_bytes:.2f} GB"
+    if size_in_bytes < 1024:
+        return f"{size_in_bytes:6.2f} B"
+    elif size_in_bytes < 1 << 20:
+        return f"{size_in_bytes / 1024:6.2f} KB"
+    elif size_in_bytes < 1 << 30:
+        return f"{size_in_bytes / 1048576:6.2f} MB"
+    else:
+        return f"{size_in_bytes / 1073741824:6.2f} GB"
+
+# strftime pattern per (day of file, today), the label only changes by day
+time_formats = {}
 
-def format_time(timestamp):
+def format_time(timestamp, now=None):
     dt = datetime.fromtimestamp(timestamp)
-    now = datetime.now()
-
-    if dt.date() == now.date():
-        return dt.strftime("today %H:%M")
-    elif dt.date() == now.replace(day=now.day-1).date():
-        return dt.strftime("yestday %H:%M")
-    elif dt.year == now.year:
-        return dt.strftime("%m-%d %H:%M")
+    if now is None:
+        now = datetime.now()
+
+    today = now.date()
+    key = (dt.toordinal(), today.toordinal())
+    fmt = time_formats.get(key)
+
+    if fmt is None:
+        if dt.date() == today:
+            fmt = "today %H:%M"
+        elif dt.date() == today - timedelta(days=1):
+            fmt = "yestday %H:%M"
+        elif dt.year == now.year:
+            fmt = "%m-%d %H:%M"
+        else:
+            fmt = "%Y-%m-%d"
+        time_formats[key] = fmt
+
+    return dt.strftime(fmt)
+
+@lru_cache(maxsize=None)
+def user_name(uid):
+    # same lookup gettarinfo does, once per uid instead of once per file
+    try:
+        import pwd
+        return pwd.getpwuid(uid).pw_name
+    except (ImportError, KeyError):
+        return ""
+
+@lru_cache(maxsize=None)
+def group_name(gid):
+    try:
+        import grp
+        return grp.getgrgid(gid).gr_name
+    except (ImportError, KeyError):
+        return ""
+
+def make_file_tarinfo(arcname, st):
+    import tarfile
+
+    # build the header from an existing stat instead of letting tarfile lstat again
+    tarinfo = tarfile.TarInfo(arcname)
+    tarinfo.size = st.st_size
+    tarinfo.mode = st.st_mode & 0o7777
+    tarinfo.mtime = int(st.st_mtime)
+    tarinfo.uid = st.st_uid
+    tarinfo.gid = st.st_gid
+    tarinfo.uname = user_name(st.st_uid)
+    tarinfo.gname = group_name(st.st_gid)
+    return tarinfo
+
+def make_dir_tarinfo(arcname, st):
+    import tarfile
+
+    tarinfo = make_file_tarinfo(arcname, st)
+    tarinfo.type = tarfile.DIRTYPE
+    tarinfo.size = 0
+    return tarinfo
+
+class PipeSink:
+    # buffered writer over a raw pipe fd; file bodies can bypass the buffer
+    # and be spliced straight into the pipe with os.sendfile
+
+    def __init__(self, fd, bufsize=64 * 1024):
+        self.fd = fd
+        self.bufsize = bufsize
+        self.buf = bytearray()
+        self.pos = 0
+
+    def write(self, data):
+        self.buf += data
+        self.pos += len(data)
+        if len(self.buf) >= self.bufsize:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        written = 0
+        while written < len(self.buf):
+            written += os.write(self.fd, self.buf[written:])
+        self.buf.clear()
+
+    def tell(self):
+        return self.pos
+
+    def sendfile(self, src_fd, count):
+        # returns the bytes sent, fewer than count if the file shrank
+        self.flush()
+        offset = 0
+        while offset < count:
+            sent = os.sendfile(self.fd, src_fd, offset, count - offset)
+            if sent == 0:
+                break
+            offset += sent
+        self.pos += offset
+        return offset
+
+def copy_body(src, dst, count, bufsize=1 << 20):
+    # like tarfile.copyfileobj, but returns the bytes copied instead of
+    # raising when the source ends early
+    remaining = count
+    while remaining > 0:
+        chunk = src.read(min(remaining, bufsize))
+        if not chunk:
+            break
+        dst.write(chunk)
+        remaining -= len(chunk)
+    return count - remaining
+
+def write_zeros(dst, count, bufsize=1 << 20):
+    while count > 0:
+        n = min(count, bufsize)
+        dst.write(bytes(n))
+        count -= n
+
+def add_member(tar, member, fileobj):
+    import tarfile
+
+    if not isinstance(fileobj, io.BufferedReader):
+        # in-memory bodies were read whole and sized from what was read
+        tar.addfile(member, fileobj)
+        return
+
+    # size the header from the fd about to be copied, as late as possible
+    member.size = os.fstat(fileobj.fileno()).st_size
+
+    # header goes through tarfile's encoder, the body is copied here so a
+    # file that shrinks after its header is written can't misalign the archive
+    sink = tar.fileobj
+    buf = member.tobuf(tar.format, tar.encoding, tar.errors)
+    sink.write(buf)
+
+    if isinstance(sink, PipeSink):
+        # the body never enters python
+        copied = sink.sendfile(fileobj.fileno(), member.size)
     else:
-        return dt.strftime("%Y-%m-%d")
+        copied = copy_body(fileobj, sink, member.size)
+
+    # pad a short body up to the size in the header, like GNU tar does
+    short = member.size - copied
+    if short:
+        write_zeros(sink, short)
+
+    blocks, remainder = divmod(member.size, tarfile.BLOCKSIZE)
+    if remainder > 0:
+        sink.write(tarfile.NUL * (tarfile.BLOCKSIZE - remainder))
+        blocks += 1
+
+    tar.offset += len(buf) + blocks * tarfile.BLOCKSIZE
+    tar.members.append(member)
+
+    if short:
+        raise OSError(f"file shrank by {short} bytes while packing, padded with zeros")
+
+@contextmanager
+def open_tar_writer(out_file, use_zstd=False, level=None):
+    import tarfile
+
+    if use_zstd:
+        import zstandard as zstd
+
+        # multi-threaded zstd frame around a streaming (uncompressed) tar
+        cctx = zstd.ZstdCompressor(level=3 if level is None else level, threads=-1)
+        with cctx.stream_writer(open(out_file, 'wb')) as stream:
+            with tarfile.open(fileobj=stream, mode="w|") as tar:
+                yield tar
+        return
+
+    import shutil
+    import subprocess
+
+    # SYNCF_GZIP_BIN picks another gzip-compatible binary, empty disables it
+    pigz = shutil.which(os.environ.get("SYNCF_GZIP_BIN", "pigz"))
+
+    # level 0 only stores, nothing to parallelize (and plain gzip rejects -0)
+    if pigz is None or level == 0:
+        with tarfile.open(out_file, "w:gz", compresslevel=9 if level is None else level) as tar:
+            yield tar
+        return
+
+    # pigz compresses on every core, tar only writes the raw stream to its stdin
+    with open(out_file, 'wb') as fp:
+        args = [pigz, "-c"] + ([f"-{level}"] if level is not None else [])
+        proc = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=fp)
+        stdin = proc.stdin
+        assert stdin is not None  # stdin=PIPE
+        try:
+            if sys.platform.startswith("linux"):
+                sink = PipeSink(stdin.fileno())
+                # tarfile only writes and tells on a "w" stream, which PipeSink covers
+                with tarfile.open(fileobj=cast(IO[bytes], sink), mode="w") as tar:
+                    yield tar
+                sink.flush()
+            else:
+                with tarfile.open(fileobj=stdin, mode="w|") as tar:
+                    yield tar
+        finally:
+            stdin.close()
+            proc.wait()
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"pigz exited with code {proc.returncode}")
+
+@contextmanager
+def open_tar_reader(package_file):
+    import tarfile
+
+    if package_file.name.endswith(".tar.zst"):
+        import zstandard as zstd
+
+        with zstd.ZstdDecompressor().stream_reader(open(package_file, 'rb')) as stream:
+            with tarfile.open(fileobj=stream, mode="r|") as tar:
+                yield tar
+        return
+
+    # pipe mode reads members in one pass without building a seekable index
+    with tarfile.open(package_file, "r|gz") as tar:
+        yield tar
+
+def read_ahead(entries, skipped_files, depth=8, buffer_limit=1 << 20):
+    # open (and for small files, read) members on a worker thread so disk
+    # reads overlap with compression; the tar itself keeps a single writer
+    import queue
+    import threading
+
+    q = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def producer():
+        try:
+            for file_path, full_path, st in entries:
+                if stop.is_set():
+                    break
+
+                member = fileobj = None
+                if file_path.endswith('/'):
+                    if st is not None and stat.S_ISDIR(st.st_mode):
+                        member = make_dir_tarinfo(file_path, st)
+                elif st is not None and stat.S_ISREG(st.st_mode):
+                    try:
+                        fileobj = open(full_path, 'rb')
+                        # the header describes the opened file, not the pre-pass stat
+                        st = os.fstat(fileobj.fileno())
+                        member = make_file_tarinfo(file_path, st)
+                        if st.st_size <= buffer_limit:
+                            with fileobj:
+                                data = fileobj.read()
+                            fileobj = io.BytesIO(data)
+                            member.size = len(data)
+                    except OSError as e:
+                        if fileobj is not None:
+                            fileobj.close()
+                        skipped_files.append((file_path, str(e)))
+                        continue
+
+                q.put((file_path, full_path, st, member, fileobj))
+        finally:
+            q.put(None)
+
+    threading.Thread(target=producer, daemon=True).start()
 
-def tar_gz_files(files, name, verbose=False):
+    try:
+        while True:
+            item = q.get()
+            if item is None:
+                break
+            yield item
+    finally:
+        # unblock the producer and release anything it already opened
+        stop.set()
+        while item is not None:
+            item = q.get()
+            if item is not None and item[4] is not None:
+                item[4].close()
+
+def tar_gz_files(files, name, verbose=False, use_zstd=False, level=None, cwd=None):
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeRemainingColumn
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{name}_{timestamp}.tar.gz"
+    suffix = ".tar.zst" if use_zstd else ".tar.gz"
+    filename = f"{name}_{timestamp}{suffix}"
 
     if not package_dir.exists():
-        console.print(f"[red]error: {package_dir} is not exists[/red]")
+        _console().print(f"[red]error: {package_dir} is not exists[/red]")
         package_dir.mkdir(exist_ok=True)
-        console.print(f"[green]Created dir {package_dir}[/green]")
+        _console().print(f"[green]Created dir {package_dir}[/green]")
 
     out_file = package_dir / filename
 
-    cwd = Path.cwd()
+    # relative paths resolve against cwd, the process directory by default
+    cwd_str = os.getcwd() if cwd is None else str(cwd)
+    sep = os.sep
 
     # count information
     total_files = 0
     total_size = 0
     skipped_files = []
 
+    # resolve every item's stat once, reusing the traversal's DirEntry cache
+    entries = []
+    total_bytes = 0
+    incompressible_bytes = 0
+    for item in files:
+        file_path, entry = item if isinstance(item, tuple) else (item, None)
+
+        if entry is not None:
+            full_path = entry.path
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                # removed since the walk, reported as not found below
+                st = None
+        else:
+            # plain strings and a single lstat, no Path objects in this loop
+            full_path = cwd_str + sep + file_path
+            try:
+                st = os.lstat(full_path)
+            except OSError:
+                st = None
+
+        if st is not None and stat.S_ISREG(st.st_mode):
+            total_bytes += st.st_size
+            if os.path.splitext(file_path)[1].lower() in incompressible_suffixes:
+                incompressible_bytes += st.st_size
+
+        entries.append((file_path, full_path, st))
+
+    # mostly media/archives: spend as little cpu as possible on compression
+    if level is None and total_bytes and incompressible_bytes / total_bytes > 0.8:
+        level = 1
+        if verbose:
+            _console().print("[cyan]content is mostly compressed already, using fast level 1[/cyan]")
+
     try:
-        console.print(
+        _console().print(
             f"[green]start pack [cyan]<{len(files)}> files[/cyan][/green]"
             f"[yellow] to {out_file}[/yellow]"
         )
-        if verbose:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                TaskProgressColumn(),
-                TimeRemainingColumn(),
-                console=console
-            ) as progress:
-                task = progress.add_task("Packing...", total=len(files))
-
-                with tarfile.open(out_file, "w:gz") as tar:
-                    for file_path in files:
-                        full_path = cwd / file_path
-
-                        if file_path.endswith('/'):
-                            dir_path = file_path.rstrip('/')
-                            full_dir_path = cwd / dir_path
-
-                            if full_dir_path.exists() and full_dir_path.is_dir():
-                                try:
-                                    tarinfo = tar.gettarinfo(name=str(full_dir_path), arcname=dir_path)
-                                    tarinfo.type = tarfile.DIRTYPE
-                                    tar.addfile(tarinfo)
-
-                                    if verbose:
-                                        progress.console.print(f"  [orange1]Added directory: {dir_path}/[/orange1]")
-                                except Exception as e:
-                                    skipped_files.append((file_path, str(e)))
-                        else:
-                            if full_path.exists() and full_path.is_file():
-                                try:
-                                    tar.add(str(full_path), arcname=file_path, recursive=False)
-                                    total_files += 1
-                                    total_size += full_path.stat().st_size
-
-                                    if verbose:
-                                        size = full_path.stat().st_size
-                                        size_str = format_size(size)
-                                        progress.console.print(f"  [blue]Added: {file_path} ({size_str})[/blue]")
-                                except Exception as e:
-                                    skipped_files.append((file_path, str(e)))
-                            else:
-                                skipped_files.append((file_path, "File not found"))
+        # a disabled Progress draws nothing, so one loop serves both modes
+        progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            TimeRemainingColumn(),
+            console=_console(),
+            disable=not verbose
+        )
 
-                        progress.update(task, advance=1)
-        else:
-            with tarfile.open(out_file, "w:gz") as tar:
-                for file_path in files:
-                    full_path = cwd / file_path
-
-                    if file_path.endswith('/'):
-                        dir_path = file_path.rstrip('/')
-                        full_dir_path = cwd / dir_path
-
-                        if full_dir_path.exists() and full_dir_path.is_dir():
-                            try:
-                                tarinfo = tar.gettarinfo(name=str(full_dir_path), arcname=dir_path)
-                                tarinfo.type = tarfile.DIRTYPE
-                                tar.addfile(tarinfo)
-                            except Exception as e:
-                                skipped_files.append((file_path, str(e)))
-                    else:
-                        if full_path.exists() and full_path.is_file():
-                            try:
-                                tar.add(str(full_path), arcname=file_path, recursive=False)
-                                total_files += 1
-                                total_size += full_path.stat().st_size
-                            except Exception as e:
-                                skipped_files.append((file_path, str(e)))
-                        else:
-                            skipped_files.append((file_path, "File not found"))
+        with progress, open_tar_writer(out_file, use_zstd, level) as tar:
+            task = progress.add_task("Packing...", total=total_bytes)
+
+            # rendering one rich line per file dominates small-file packs,
+            # so detail lines are flushed in batches
+            pending = []
+
+            for file_path, full_path, st, member, fileobj in read_ahead(entries, skipped_files):
+
+                if file_path.endswith('/'):
+                    if member is not None:
+                        try:
+                            tar.addfile(member)
+
+                            if verbose:
+                                pending.append(f"  [orange1]Added directory: {file_path}[/orange1]")
+                        except Exception as e:
+                            skipped_files.append((file_path, str(e)))
+                elif member is not None:
+                    try:
+                        with fileobj:
+                            add_member(tar, member, fileobj)
+                        total_files += 1
+                        total_size += member.size
+
+                        if verbose:
+                            size_str = format_size(member.size)
+                            pending.append(f"  [blue]Added: {file_path} ({size_str})[/blue]")
+                    except Exception as e:
+                        skipped_files.append((file_path, str(e)))
+
+                    progress.update(task, advance=st.st_size)
+                elif st is not None and stat.S_ISLNK(st.st_mode):
+                    try:
+                        tar.add(full_path, arcname=file_path, recursive=False)
+                    except Exception as e:
+                        skipped_files.append((file_path, str(e)))
+                else:
+                    skipped_files.append((file_path, "File not found"))
+
+                if len(pending) >= 64:
+                    progress.console.print("\n".join(pending))
+                    pending.clear()
+
+            if pending:
+                progress.console.print("\n".join(pending))
 
         size_str = format_size(total_size)
 
-        console.print(f"[green]✓ Package complete: {out_file}[/green]")
-        console.print(f"[cyan]Packed {total_files} files, total size: {size_str}[/cyan]")
+        _console().print(f"[green]✓ Package complete: {out_file}[/green]")
+        _console().print(f"[cyan]Packed {total_files} files, total size: {size_str}[/cyan]")
 
         if skipped_files:
-            console.print(f"[yellow]Skipped {len(skipped_files)} items:[/yellow]")
+            _console().print(f"[yellow]Skipped {len(skipped_files)} items:[/yellow]")
             for file_path, reason in skipped_files[:5]:  # 只显示前5个
-                console.print(f"  [orange1]{file_path}: {reason}[/orange1]")
+                _console().print(f"  [orange1]{file_path}: {reason}[/orange1]")
             if len(skipped_files) > 5:
-                console.print(f"  [orange1]... and {len(skipped_files) - 5} more[/orange1]")
+                _console().print(f"  [orange1]... and {len(skipped_files) - 5} more[/orange1]")
 
         return True
 
     except Exception as e:
-        console.print(f"[red]error: fail to package files [cyan]{e}[/cyan][/red]")
+        _console().print(f"[red]error: fail to package files [cyan]{e}[/cyan][/red]")
         return False
 
 
-def package_files(filelist, name, verbose=False):
+def iter_matches(path, include_spec, exclude_spec, rel_dir="", visited=None):
+    # walk with scandir so excluded directories are pruned before descending
+    entries = []
+    try:
+        # stat before listing, so a change during the walk invalidates the cache
+        mtime_ns = os.stat(path).st_mtime_ns if visited is not None else None
+
+        with os.scandir(path) as it:
+            for entry in it:
+                rel_path = rel_dir + entry.name
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if is_dir:
+                    rel_path += '/'
+                entries.append((rel_path, entry, is_dir))
+    except OSError:
+        # unreadable directory, skipped like os.walk does
+        return
+
+    if visited is not None:
+        visited.append((rel_dir, mtime_ns))
+
+    # classify the whole directory with one batched call per spec
+    rel_paths = [rel_path for rel_path, _, _ in entries]
+    if exclude_spec:
+        excluded = set(exclude_spec.match_files(rel_paths))
+        rel_paths = [rel_path for rel_path in rel_paths if rel_path not in excluded]
+    else:
+        excluded = ()
+    included = set(include_spec.match_files(rel_paths))
 
-    result_files = []
+    for rel_path, entry, is_dir in entries:
+        if rel_path in excluded:
+            continue
 
-    if not os.path.exists(filelist):
-        console.print(f"[red]error: [cyan]< {filelist} >[/cyan] is not exists")
-        return False
+        if rel_path in included:
+            yield rel_path, entry
 
-    with open(filelist, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+        if is_dir:
+            yield from iter_matches(entry.path, include_spec, exclude_spec, rel_path, visited)
 
-    include_rules = []
-    exclude_rules = []
 
-    for line in lines:
-        if not line or line.startswith("#"):
-            continue
+def scan_cache_key(cwd, filelist):
+    import hashlib
 
-        if line.startswith('!'):
-            exclude_rules.append(line[1:])
-        else:
-            include_rules.append(line)
+    # one entry per (tree, filelist), rewritten in place when either changes
+    raw = f"{cwd}|{os.path.abspath(filelist)}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
 
-    include_spec = PathSpec.from_lines(
-        GitWildMatchPattern, include_rules
-    ) if include_rules else None
+def filelist_stamp(filelist):
+    st = os.stat(filelist)
+    return [st.st_mtime_ns, st.st_size]
 
-    if include_spec == None:
-        console.print(f"[red]error: include rules is empty")
-        return False
+def load_scan_cache(cwd, key, stamp):
+    import json
+
+    cache_file = scan_cache_dir / f"{key}.json"
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    # an edited filelist means different rules; any add/remove/rename below
+    # a walked directory bumps its mtime, file contents don't matter here
+    # since they are read at pack time
+    cwd_str = str(cwd)
+    try:
+        if cache["filelist"] != stamp:
+            raise ValueError("filelist")
+        for rel_dir, mtime_ns in cache["dirs"]:
+            if os.stat(cwd_str + os.sep + rel_dir).st_mtime_ns != mtime_ns:
+                raise ValueError(rel_dir)
+    except (OSError, ValueError, KeyError, TypeError):
+        try:
+            cache_file.unlink()
+        except OSError:
+            pass
+        return None
+
+    return cache.get("files")
+
+def save_scan_cache(key, files, visited, started_ns, stamp):
+    import json
+
+    # a directory or filelist touched within the mtime granularity of the
+    # walk could change again unnoticed, so racy trees are simply not cached
+    racy_ns = started_ns - 2_000_000_000
+    if stamp[0] >= racy_ns or any(mtime_ns >= racy_ns for _, mtime_ns in visited):
+        return
+
+    cache_file = scan_cache_dir / f"{key}.json"
+    tmp_file = cache_file.with_suffix(".tmp")
+    try:
+        scan_cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"files": files, "dirs": visited, "filelist": stamp, "built": started_ns}, f)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
 
+def package_files(filelist, name, verbose=False, use_zstd=False, level=None, cwd=None):
+    from pathspec import GitIgnoreSpec
 
-    exclude_spec = PathSpec.from_lines(
-        GitWildMatchPattern, exclude_rules
-    ) if exclude_rules else None
+    result_files = []
 
-    cwd = Path.cwd()
+    # the filelist and the rules inside it are relative to cwd
+    cwd = Path.cwd() if cwd is None else Path(cwd)
+    filelist_path = os.path.join(cwd, filelist)
 
-    all_items = []
+    if not os.path.exists(filelist_path):
+        _console().print(f"[red]error: [cyan]< {filelist} >[/cyan] is not exists")
+        return False
 
-    for root, dirs, files in os.walk(cwd):
-        root_path = pathlib.Path(root)
+    # one raw read, no universal-newline translation; strip() below drops any \r
+    with open(filelist_path, 'rb') as f:
+        data = f.read().decode('utf-8', errors='replace')
 
-        for file in files:
-            file_path = root_path / file
-            rel_path = file_path.relative_to(cwd)
-            all_items.append(str(rel_path))
+    stripped = (line.strip() for line in data.split('\n'))
+    lines = [line for line in stripped if line and line[0] != '#']
 
-        for dir_name in dirs:
-            dir_path = root_path / dir_name
-            rel_path = dir_path.relative_to(cwd)
-            all_items.append(str(rel_path) + '/')
+    include_rules = [line for line in lines if line[0] != '!']
+    exclude_rules = [line[1:] for line in lines if line[0] == '!']
 
-    result = []
+    include_spec = GitIgnoreSpec.from_lines(
+        include_rules
+    ) if include_rules else None
 
-    for item in all_items:
-        matched_include = include_spec.match_file(item)
+    if include_spec == None:
+        _console().print(f"[red]error: include rules is empty")
+        return False
 
-        matched_exclude = False
-        if exclude_spec:
-            matched_exclude = exclude_spec.match_file(item)
 
-        if matched_include and not matched_exclude:
-            result.append(item)
+    # exclude rules are only consulted while walking, so whole subtrees get pruned
+    exclude_spec = GitIgnoreSpec.from_lines(
+        exclude_rules
+    ) if exclude_rules else None
+
+    # a repeated run with an unchanged filelist and tree reuses the last walk
+    cache_key = scan_cache_key(cwd, filelist_path)
+    stamp = filelist_stamp(filelist_path)
+    result = load_scan_cache(cwd, cache_key, stamp)
+
+    if result is None:
+        visited = []
+        started_ns = time.time_ns()
+        result = list(iter_matches(cwd, include_spec, exclude_spec, visited=visited))
+
+        if result:
+            save_scan_cache(cache_key, [rel_path for rel_path, _ in result], visited, started_ns, stamp)
 
     if result:
-        tar_gz_files(result, name, verbose)
+        tar_gz_files(result, name, verbose, use_zstd, level, cwd)
     else:
-        console.print(f"[cyan]warnning: have no files matched rules")
+        _console().print(f"[cyan]warnning: have no files matched rules")
         return False
 
     return True
 
 
-def show_package_list():
+def scan_packages():
+    # one scandir pass, each package is stat'ed exactly once
+    with os.scandir(package_dir) as it:
+        return [
+            (entry.name, entry.path, entry.stat())
+            for entry in it
+            if entry.name.endswith(package_suffixes) and entry.is_file(follow_symlinks=False)
+        ]
 
+def show_package_list():
+    from rich.table import Table
 
     if not package_dir.exists():
-        console.print(f"[red]error: {package_dir} is not exists[/red]")
+        _console().print(f"[red]error: {package_dir} is not exists[/red]")
         package_dir.mkdir(exist_ok=True)
-        console.print(f"[green]Created dir {package_dir}[/green]")
+        _console().print(f"[green]Created dir {package_dir}[/green]")
         return False
 
     try:
-        tar_files = list(package_dir.glob("*tar.gz"))
+        tar_files = scan_packages()
 
         files_count = len(tar_files)
 
+        now = datetime.now()
+
         file_infos = []
-        for file in tar_files:
-            stat = file.stat()
+        for file_name, file_path, st in tar_files:
             file_infos.append({
-                'name': file.name,
-                'path': str(file),
-                'size': stat.st_size,
-                'size_formatted': format_size(stat.st_size),
-                'mtime': stat.st_mtime,
-                'mtime_formatted': format_time(stat.st_mtime),
-                'mtim_dt': datetime.fromtimestamp(stat.st_mtime)
+                'name': file_name,
+                'path': file_path,
+                'size': st.st_size,
+                'size_formatted': format_size(st.st_size),
+                'mtime': st.st_mtime,
+                'mtime_formatted': format_time(st.st_mtime, now),
+                'mtim_dt': datetime.fromtimestamp(st.st_mtime)
             })
         # sort by time
         file_infos.sort(key = lambda x: x['mtime'], reverse = True)
 
-        choices = []
+        table = Table(title = f"please select file, totol: {files_count}")
+        table.add_column("#", justify = "right", style = "cyan")
+        table.add_column("name")
+        table.add_column("size", justify = "right")
+        table.add_column("time")
+
         for index, info in enumerate(file_infos, 1):
-            index_str = f"{index:3d}"
-            display_text = (
-                f"{index_str}. {info['name']} "
-                f"({info['size_formatted'].strip()}, {info['mtime_formatted']})"
+            table.add_row(
+                str(index), info['name'],
+                info['size_formatted'].strip(), info['mtime_formatted']
             )
-            choices.append((display_text, info['name']))
 
-        choices.append(("exit", None))
+        _console().print(table)
 
-        question = [
-            inquirer.List(
-                'file',
-                message = f"please select file, totol: {files_count}",
-                choices = choices,
-                carousel = True
-            )
-        ]
+        try:
+            raw = input("select # (empty to exit): ").strip()
+        except (KeyboardInterrupt, EOFError):
+            return False
 
-        answers = inquirer.prompt(
-            question
-        )
+        if not raw:
+            return False
 
-        if answers and answers['file'] is not None:
-            selected_file = answers['file']
-            console.print(f"[green]select package {selected_file}[/green]")
-            return selected_file
+        try:
+            index = int(raw) - 1
+        except ValueError:
+            index = -1
 
-        return False
+        if not 0 <= index < files_count:
+            _console().print(f"[red]error: invalid selection [cyan]{raw}[/cyan][/red]")
+            return False
+
+        selected_file = file_infos[index]['name']
+        _console().print(f"[green]select package {selected_file}[/green]")
+        return selected_file
 
     except Exception as e:
-        console.print(f"[red]error:{e}")
+        _console().print(f"[red]error:{e}")
         return False
 
 def unpackage_files(verbose=False):
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeRemainingColumn
 
     package_name = show_package_list()
 
     if package_name is None or package_name is False:
-        console.print(f"[yellow]you select no files[/yellow]")
+        _console().print(f"[yellow]you select no files[/yellow]")
         return True
 
     package_file = package_dir / package_name
 
-    questions = [
-        inquirer.Confirm('confirm',
-                       message="are you sure unpack to this dir ?",
-                       default=True),
-    ]
-
-    answers = inquirer.prompt(questions)
+    try:
+        confirm = input("are you sure unpack to this dir ? [Y/n]: ").strip().lower() not in ('n', 'no')
+    except (KeyboardInterrupt, EOFError):
+        confirm = False
 
-    if not answers or not answers['confirm']:
-        console.print("[yellow]cancel unpack action[/yellow]")
+    if not confirm:
+        _console().print("[yellow]cancel unpack action[/yellow]")
         return False
 
-    console.print(f"[yellow]Will unpackage the file: {package_file}[/yellow]")
+    _console().print(f"[yellow]Will unpackage the file: {package_file}[/yellow]")
 
     try:
         if verbose:
@@ -342,11 +757,11 @@ def unpackage_files(verbose=False):
                 BarColumn(),
                 TaskProgressColumn(),
                 TimeRemainingColumn(),
-                console=console
+                console=_console()
             ) as progress:
-                with tarfile.open(package_file, "r:gz") as tar:
-                    file_count = len(tar.getmembers())
-                    task = progress.add_task("unpacking...", total=file_count)
+                with open_tar_reader(package_file) as tar:
+                    # members are streamed, so the total is unknown up front
+                    task = progress.add_task("unpacking...", total=None)
 
                     for member in tar:
                         if verbose:
@@ -358,89 +773,113 @@ def unpackage_files(verbose=False):
                         tar.extract(member, path=".", set_attrs=False)
                         progress.update(task, advance=1)
         else:
-            with tarfile.open(package_file, "r:gz") as tar:
+            with open_tar_reader(package_file) as tar:
                 tar.extractall(path=".")
 
-        console.print(f"[green]✓ unpack finished: {package_file}[/green]")
+        _console().print(f"[green]✓ unpack finished: {package_file}[/green]")
         return True
 
     except Exception as e:
-        console.print(f"[red]unpack action is failed: {e}[/red]")
+        _console().print(f"[red]unpack action is failed: {e}[/red]")
         return False
 
+def clear_scan_cache():
+    # drop every cached walk, the next pack of each filelist rescans
+    try:
+        with os.scandir(scan_cache_dir) as it:
+            cache_files = [entry.path for entry in it if entry.is_file(follow_symlinks=False)]
+    except OSError:
+        return 0
+
+    removed = 0
+    for cache_file in cache_files:
+        try:
+            os.unlink(cache_file)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
 def clean_all_packages(verbose=False):
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+
     if not package_dir.exists():
-        console.print(f"[yellow]Package directory '{package_dir}' does not exist.[/yellow]")
+        _console().print(f"[yellow]Package directory '{package_dir}' does not exist.[/yellow]")
         return True
 
-    all_files = list(package_dir.glob("*.tar.gz"))
+    removed = clear_scan_cache()
+    if verbose and removed:
+        _console().print(f"[cyan]Cleared {removed} scan cache files[/cyan]")
+
+    all_files = scan_packages()
 
     if not all_files:
-        console.print(
+        _console().print(
             f"[yellow]have no [/yellow] "
-                "[blue].tar.gz[/blue] "
+                "[blue].tar.gz/.tar.zst[/blue] "
                 "[yellow]files need clean.[/yellow]")
         return True
 
-    total_size = sum(f.stat().st_size for f in all_files)
+    total_size = sum(st.st_size for _, _, st in all_files)
     size_str = format_size(total_size)
 
-    console.print(f"[yellow]Found {len(all_files)} package files (total: {size_str})[/yellow]")
+    _console().print(f"[yellow]Found {len(all_files)} package files (total: {size_str})[/yellow]")
 
     try:
-        if verbose:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                TaskProgressColumn(),
-                console=console
-            ) as progress:
-                task = progress.add_task("[blue]Deleting files...", total=len(all_files))
-                deleted_count = 0
-                for file_path in all_files:
-                    try:
-                        file_path.unlink()
-                        console.print(f"  [orange1]Deleted: {file_path.name}[/orange1]")
-                        deleted_count += 1
-                    except Exception as e:
-                        console.print(f"  [yellow]Failed to delete {file_path.name}: {e}[/yellow]")
-                    progress.update(task, advance=1)
-                console.print(f"[green]✓ Deleted {deleted_count} files.[/green]")
-        else:
+        progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            console=_console(),
+            disable=not verbose
+        )
+
+        with progress:
+            task = progress.add_task("[blue]Deleting files...", total=len(all_files))
             deleted_count = 0
-            for file_path in all_files:
+            for file_name, file_path, _ in all_files:
                 try:
-                    file_path.unlink()
+                    os.unlink(file_path)
+                    if verbose:
+                        _console().print(f"  [orange1]Deleted: {file_name}[/orange1]")
                     deleted_count += 1
                 except Exception as e:
                     if verbose:
-                        console.print(f"[yellow]Failed to delete {file_path.name}: {e}[/yellow]")
-            console.print(f"[green]✓ Deleted {deleted_count} files.[/green]")
+                        _console().print(f"  [yellow]Failed to delete {file_name}: {e}[/yellow]")
+
+                progress.update(task, advance=1)
+
+        _console().print(f"[green]✓ Deleted {deleted_count} files.[/green]")
 
         return True
 
     except Exception as e:
-        console.print(f"[red]Error during cleanup: {e}[/red]")
+        _console().print(f"[red]Error during cleanup: {e}[/red]")
         return False
 
+# rendered once on first use; argparse shows the plain text in -h
+banner_rendered = None
+
 def print_banner():
-    banner = """
-         ::::::::::  ##::    ::## ##::   ::##  :::::::::: :::::::::::: 
-        ::::::::::::  ##::  ::##  ###::  ::## :::::::::::: :::::::::::: 
-        ::::::         ########   ####:: ::## ::::::       ::::::       
-         ::::::::::     ######    ## ::####:: ::::::       ::::::::::   
-             :::::::     ####     ##  ::###:: ::::::       ::::::::::   
-        ::::::::::::     ####     ##   ::##:: :::::::::::: ::::::       
-         ::::::::::      ####     ##    ::##   :::::::::: ::::::       
+    global banner_rendered
 
-    """
-    console.print(banner, style="bold cyan")
+    if not sys.stdout.isatty():
+        print(banner)
+        return 0
+
+    if banner_rendered is None:
+        console = _console()
+        with console.capture() as capture:
+            console.print(banner, style="bold cyan")
+        banner_rendered = capture.get()
+
+    print(banner_rendered, end="")
     return 0
 
 def parse_args():
     parser = argparse.ArgumentParser(
-        description = """
+        description = banner + """
             syncf - elegent tool to package
         """,
         formatter_class = argparse.RawDescriptionHelpFormatter
@@ -472,19 +911,36 @@ def parse_args():
         help = "clean all the packages"
     )
 
+    parser.add_argument(
+        "--zstd", action = "store_true",
+        help = "compress with zstd instead of gzip (needs zstandard)"
+    )
+
+    parser.add_argument(
+        "--level", type = int, metavar = "N", choices = range(0, 23),
+        help = "compression level, 0-9 for gzip (0 stores only) or 1-22 for zstd, "
+               "overrides the automatic choice"
+    )
 
-    return parser.parse_args()
 
-def main():
+    args = parser.parse_args()
 
-    # get the args
-    if "-h" in sys.argv or "--help" in sys.argv or len(sys.argv) == 1:
-        print_banner()
+    # the valid range depends on the backend, reject it before packing starts
+    if args.level is not None:
+        if args.zstd and args.level < 1:
+            parser.error("argument --level: zstd levels are 1-22")
+        if not args.zstd and args.level > 9:
+            parser.error("argument --level: gzip levels are 0-9")
 
+    return args
+
+def main():
+
+    # get the args, -h prints the plain banner through argparse itself
     args = parse_args()
     if args.z:
         filelist, name = args.z
-        package_files(filelist, name, args.v)
+        package_files(filelist, name, args.v, args.zstd, args.level)
     elif args.u:
         unpackage_files(args.v)
     elif args.l:
@@ -492,7 +948,8 @@ def main():
     elif args.c:
         clean_all_packages(args.v)
     else:
-        console.print("use <syncf -h> show helper")
+        print_banner()
+        _console().print("use <syncf -h> show helper")
 
     return 0
 
@@ -6,79 +6,67 @@ Run in test directory to test all CLI functions
 
 import os
 import sys
-import shutil
-import tempfile
-import subprocess
-import time
 from pathlib import Path
 import random
-import string
 from datetime import datetime
+from itertools import accumulate
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 # Add project root to Python path
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
-
-from src.cli import package_files, tar_gz_files, unpackage_files, show_package_list, clean_all_packages
-
-def print_step(step_num, description):
-    """Print test step header"""
-    print(f"\n{'='*60}")
-    print(f"STEP {step_num}: {description}")
-    print(f"{'='*60}")
-
-def create_test_files(base_dir):
-    """Create test file structure"""
-    print("Creating test file structure...")
-    
-    # Test file structure
-    file_structure = [
-        # Root files
-        "main.py",
-        "config.yaml",
-        "requirements.txt",
-        "README.md",
-        "data.csv",
-        ".env",
-        ".gitignore",
-        
-        # src directory
-        "src/__init__.py",
-        "src/module1.py",
-        "src/module2.py",
-        "src/utils/__init__.py",
-        "src/utils/helpers.py",
-        "src/utils/validators.py",
-        "src/tests/__init__.py",
-        "src/tests/test_basic.py",
-        
-        # docs directory
-        "docs/index.md",
-        "docs/api.md",
-        "docs/images/placeholder.png",
-        
-        # data directory
-        "data/raw/dataset1.csv",
-        "data/raw/dataset2.csv",
-        "data/processed/results.json",
-        
-        # logs directory
-        "logs/app.log",
-        "logs/error.log",
-        
-        # Temporary and build files
-        "temp.txt",
-        "build/compiled.so",
-        "dist/package.whl",
-        "__pycache__/module.cpython-39.pyc",
-        
-        # Hidden directory
-        ".cache/temp_data.bin",
-    ]
-    
-    # Special content files
-    special_files = {
-        "config.yaml": """
+_CLI_PATH = str(project_root / 'src' / 'syncf.py')
+
+# Test file structure
+_FILE_STRUCTURE = (
+    # Root files
+    "main.py",
+    "config.yaml",
+    "requirements.txt",
+    "README.md",
+    "data.csv",
+    ".env",
+    ".gitignore",
+
+    # src directory
+    "src/__init__.py",
+    "src/module1.py",
+    "src/module2.py",
+    "src/utils/__init__.py",
+    "src/utils/helpers.py",
+    "src/utils/validators.py",
+    "src/tests/__init__.py",
+    "src/tests/test_basic.py",
+
+    # docs directory
+    "docs/index.md",
+    "docs/api.md",
+    "docs/images/placeholder.png",
+
+    # data directory
+    "data/raw/dataset1.csv",
+    "data/raw/dataset2.csv",
+    "data/processed/results.json",
+
+    # logs directory
+    "logs/app.log",
+    "logs/error.log",
+
+    # Temporary and build files
+    "temp.txt",
+    "build/compiled.so",
+    "dist/package.whl",
+    "__pycache__/module.cpython-39.pyc",
+
+    # Hidden directory
+    ".cache/temp_data.bin",
+)
+
+# Special content files
+_SPECIAL_FILES = MappingProxyType({
+    "config.yaml": """
 database:
   host: localhost
   port: 5432
@@ -90,7 +78,7 @@ logging:
   file: app.log
   max_size: 10MB
 """,
-        "main.py": '''#!/usr/bin/env python3
+    "main.py": '''#!/usr/bin/env python3
 """
 Test main program
 """
@@ -105,7 +93,7 @@ def main():
 if __name__ == "__main__":
     sys.exit(main())
 ''',
-        ".gitignore": """
+    ".gitignore": """
 # Python
 __pycache__/
 *.py[cod]
@@ -129,7 +117,7 @@ build/
 dist/
 *.egg-info/
 """,
-        "README.md": """# Test Project
+    "README.md": """# Test Project
 
 This is a test project for packaging tool.
 
@@ -137,24 +125,10 @@ This is a test project for packaging tool.
 - Test packaging
 - Test unpackaging
 """
-    }
-    
-    created_count = 0
-    for item in file_structure:
-        path = base_dir / item
-        
-        if item.endswith('/'):
-            # Directory
-            path.mkdir(parents=True, exist_ok=True)
-        else:
-            # Ensure parent directory exists
-            path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Write file content
-            if item in special_files:
-                content = special_files[item]
-            elif item.endswith('.py'):
-                content = f'''"""Test Python file: {item}"""
+})
+
+# Test file content by suffix, filled in with str.format(item=..., timestamp=...)
+_PY_TEMPLATE = '''"""Test Python file: {item}"""
 import os
 
 def test_function():
@@ -163,68 +137,57 @@ def test_function():
 if __name__ == "__main__":
     print(test_function())
 '''
-            elif item.endswith(('.txt', '.log')):
-                content = f"Test log content - {item}\n" + "="*50 + "\n" + \
-                         f"Created: {datetime.now()}\n" + \
-                         f"File size: auto-generated\n"
-            elif item.endswith('.csv'):
-                content = "id,name,value,date\n" + \
-                         "1,test1,100.5,2024-01-01\n" + \
-                         "2,test2,200.3,2024-01-02\n" + \
-                         "3,test3,300.1,2024-01-03\n"
-            elif item.endswith('.json'):
-                content = '''{
+
+_LOG_TEMPLATE = "Test log content - {item}\n" + "="*50 + "\n" + \
+                "Created: {timestamp}\n" + \
+                "File size: auto-generated\n"
+
+_CSV_TEMPLATE = "id,name,value,date\n" + \
+                "1,test1,100.5,2024-01-01\n" + \
+                "2,test2,200.3,2024-01-02\n" + \
+                "3,test3,300.1,2024-01-03\n"
+
+_JSON_TEMPLATE = '''{{
   "name": "Test data",
   "version": "1.0.0",
-  "timestamp": "''' + datetime.now().isoformat() + '''",
-  "data": {
+  "timestamp": "{timestamp}",
+  "data": {{
     "items": [
-      {"id": 1, "value": "test1"},
-      {"id": 2, "value": "test2"}
+      {{"id": 1, "value": "test1"}},
+      {{"id": 2, "value": "test2"}}
     ]
-  }
-}'''
-            elif item.endswith('.md'):
-                content = f"# {item}\n\nTest Markdown file content\n\nCreated: {datetime.now()}"
-            else:
-                # Default content
-                content = f"File: {item}\nGenerated for testing\nTime: {datetime.now()}"
-            
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            created_count += 1
-    
-    print(f"✓ Created {created_count} test files and directories")
-    
-    # Create random size files
-    print("Creating random size files for testing...")
-    for i in range(5):
-        filename = base_dir / f"random_data_{i}.bin"
-        size = random.randint(1024, 10240)  # 1KB to 10KB
-        with open(filename, 'wb') as f:
-            f.write(os.urandom(size))
-        created_count += 1
-    
-    return created_count
-
-def create_test_filelists(base_dir):
-    """Create various test filelists"""
-    print("Creating test filelists...")
-    
-    filelists = {
-        "include_all.txt": """
+  }}
+}}'''
+
+_MD_TEMPLATE = "# {item}\n\nTest Markdown file content\n\nCreated: {timestamp}"
+
+_DEFAULT_TEMPLATE = "File: {item}\nGenerated for testing\nTime: {timestamp}"
+
+# Keyed by the text after the last dot
+_BY_SUFFIX = {
+    'py': _PY_TEMPLATE,
+    'txt': _LOG_TEMPLATE,
+    'log': _LOG_TEMPLATE,
+    'csv': _CSV_TEMPLATE,
+    'json': _JSON_TEMPLATE,
+    'md': _MD_TEMPLATE,
+}
+
+# Test filelists
+_FILELISTS = MappingProxyType({
+    "include_all.txt": """
 # Include all files
 *
 """,
-        "include_py_only.txt": """
+    "include_py_only.txt": """
 # Include only Python files
 *.py
 """,
-        "include_src_dir.txt": """
+    "include_src_dir.txt": """
 # Include src directory
 src/
 """,
-        "exclude_build.txt": """
+    "exclude_build.txt": """
 # Include all, exclude build files
 *
 !build/
@@ -232,7 +195,7 @@ src/
 !__pycache__/
 *.pyc
 """,
-        "include_data_and_docs.txt": """
+    "include_data_and_docs.txt": """
 # Include data and docs
 data/
 docs/
@@ -240,7 +203,7 @@ docs/
 *.csv
 *.json
 """,
-        "complex_rules.txt": """
+    "complex_rules.txt": """
 # Complex rules
 *.py
 *.yaml
@@ -251,20 +214,230 @@ data/processed/
 !temp.txt
 !__pycache__/
 """,
-        "empty_list.txt": """
+    "empty_list.txt": """
 # This filelist won't match any files
 *.tmp
 non_existent_dir/
 """
-    }
+})
+
+def _list_files(tree_map, path):
+    """Names of regular files directly under path, rescanned only when its mtime moved"""
+    if tree_map is None:
+        tree_map = {}
     
-    for filename, content in filelists.items():
-        path = base_dir / filename
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(content)
+    path = Path(path)
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = tree_map.get(path)
+    if cached is None or cached[0] != mtime_ns:
+        with os.scandir(path) as it:
+            names = [entry.name for entry in it if entry.is_file(follow_symlinks=False)]
+        cached = tree_map[path] = (mtime_ns, names)
+    return cached[1]
+
+def _write_files_uring(prepared):
+    """Write (path, bytes) pairs with a single batched io_uring submission"""
+    import liburing
     
-    print(f"✓ Created {len(filelists)} test filelists")
-    return list(filelists.keys())
+    ring = liburing.Ring()
+    cqe = liburing.Cqe()
+    liburing.io_uring_queue_init(len(prepared), ring)
+    fds = []
+    try:
+        for index, (path, data) in enumerate(prepared):
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            fds.append(fd)
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_write(sqe, fd, data)
+            liburing.io_uring_sqe_set_data64(sqe, index)
+        
+        liburing.io_uring_submit(ring)
+        
+        for _ in prepared:
+            liburing.io_uring_wait_cqe(ring, cqe)
+            res = cqe[0].res
+            index = liburing.io_uring_cqe_get_data64(cqe[0])
+            liburing.io_uring_cqe_seen(ring, cqe[0])
+            if res < 0:
+                raise OSError(-res, os.strerror(-res), str(prepared[index][0]))
+            if res != len(prepared[index][1]):
+                raise OSError(f"short write: {prepared[index][0]}")
+    finally:
+        for fd in fds:
+            os.close(fd)
+        liburing.io_uring_queue_exit(ring)
+
+def _write_file(item):
+    """Write one (path, bytes) pair with raw os.open/os.write, no file object"""
+    path, data = item
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def _write_files(prepared):
+    """Write (path, bytes) pairs, batched through io_uring when available"""
+    if sys.platform.startswith('linux'):
+        try:
+            _write_files_uring(prepared)
+            return
+        except Exception:
+            # liburing missing, io_uring disabled by the kernel, ...
+            pass
+    
+    # Files are independent, overlap their write latency
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        list(ex.map(_write_file, prepared))
+
+def _fast_rmtree(root):
+    """Remove a directory tree like rmtree(ignore_errors=True), unlinking files in parallel"""
+    def unlink(path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+    
+    def remove(path, ex):
+        files, dirs = [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    # Symlinks to directories are unlinked, not followed
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.path)
+                    else:
+                        files.append(entry.path)
+        except OSError:
+            return
+        list(ex.map(unlink, files))
+        for d in dirs:
+            remove(d, ex)
+        try:
+            os.rmdir(path)
+        except OSError:
+            pass
+    
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        remove(root, ex)
+
+def _prompt(msg, default='n'):
+    """Ask on a terminal, answer default when stdin is not interactive"""
+    if not sys.stdin.isatty():
+        return default
+    return input(msg).strip().lower()
+
+@contextmanager
+def _pigz_env():
+    """Point SYNCF_GZIP_BIN at pigz for the block, yields its path or None"""
+    import shutil
+    pigz = shutil.which("pigz")
+    saved = os.environ.get("SYNCF_GZIP_BIN")
+    if pigz:
+        os.environ["SYNCF_GZIP_BIN"] = pigz
+    try:
+        yield pigz
+    finally:
+        if saved is None:
+            os.environ.pop("SYNCF_GZIP_BIN", None)
+        else:
+            os.environ["SYNCF_GZIP_BIN"] = saved
+
+def _packed_by_pigz(name):
+    """Whether the newest <name>_*.tar.gz was compressed by the external binary"""
+    from src.syncf import package_dir
+    archive = max(package_dir.glob(f"{name}_*.tar.gz"), key=lambda p: p.stat().st_mtime)
+    with open(archive, 'rb') as f:
+        header = f.read(4)
+    # tarfile's GzipFile stores the file name (FNAME flag), pigz fed by a pipe does not
+    return not header[3] & 0x08
+
+def print_step(step_num, description):
+    """Print test step header"""
+    print(f"\n{'='*60}")
+    print(f"STEP {step_num}: {description}")
+    print(f"{'='*60}")
+
+def create_test_files(base_dir):
+    """Create test file structure"""
+    print("Creating test file structure...")
+    
+    # One clock read for the whole run
+    timestamp = datetime.now().isoformat()
+    
+    created_count = 0
+    directories = set()
+    prepared = []
+    for item in _FILE_STRUCTURE:
+        path = base_dir / item
+        
+        if item.endswith('/'):
+            # Directory
+            directories.add(path)
+        else:
+            directories.add(path.parent)
+            
+            # Write file content
+            content = _SPECIAL_FILES.get(item)
+            if content is None:
+                suffix = item.rpartition('.')[2]
+                template = _BY_SUFFIX.get(suffix, _DEFAULT_TEMPLATE)
+                content = template.format(item=item, timestamp=timestamp)
+            
+            # Encode once so each worker issues a single write
+            prepared.append((path, content.encode('utf-8')))
+            created_count += 1
+    
+    # Create each directory once, parents before children
+    for directory in sorted(directories, key=lambda d: len(d.parts)):
+        os.makedirs(directory, exist_ok=True)
+    
+    print(f"✓ Created {created_count} test files and directories")
+    
+    # Create random size files, sliced out of a single draw from a seeded
+    # generator so every run produces the same payloads
+    print("Creating random size files for testing...")
+    rng = random.Random(0xC0FFEE)
+    sizes = [rng.randint(1024, 10240) for _ in range(5)]  # 1KB to 10KB
+    total = sum(sizes)
+    # Same bytes as rng.randbytes(total), which needs Python 3.9+; sliced as
+    # plain bytes since the io_uring binding does not take memoryviews
+    pool = rng.getrandbits(total * 8).to_bytes(total, 'little')
+    for i, (end, size) in enumerate(zip(accumulate(sizes), sizes)):
+        filename = base_dir / f"random_data_{i}.bin"
+        prepared.append((filename, pool[end - size:end]))
+        created_count += 1
+    
+    _write_files(prepared)
+    
+    # Directory -> (mtime_ns, file names) of the tree just written
+    names_by_dir = {}
+    for path, _ in prepared:
+        names_by_dir.setdefault(path.parent, []).append(path.name)
+    tree_map = {d: (os.stat(d).st_mtime_ns, names_by_dir.get(d, [])) for d in directories}
+    
+    return created_count, tree_map
+
+def create_test_filelists(base_dir, tree_map=None):
+    """Create various test filelists"""
+    print("Creating test filelists...")
+    
+    _write_files([(base_dir / filename, content.encode('utf-8'))
+                  for filename, content in _FILELISTS.items()])
+    
+    # Keep the cached root listing valid
+    if tree_map is not None and base_dir in tree_map:
+        names = tree_map[base_dir][1]
+        names.extend(name for name in _FILELISTS if name not in names)
+        tree_map[base_dir] = (os.stat(base_dir).st_mtime_ns, names)
+    
+    print(f"✓ Created {len(_FILELISTS)} test filelists")
+    return list(_FILELISTS)
 
 def setup_test_environment(base_dir):
     """Setup complete test environment"""
@@ -273,101 +446,105 @@ def setup_test_environment(base_dir):
     print("="*60)
     
     # Create test files
-    file_count = create_test_files(base_dir)
+    file_count, tree_map = create_test_files(base_dir)
     print(f"Total created: {file_count} test files")
     
     # Create filelists
-    create_test_filelists(base_dir)
+    create_test_filelists(base_dir, tree_map)
     
-    return True
+    return tree_map
 
 def test_basic_packaging(base_dir, test_name="test_package"):
     """Test basic packaging functionality"""
+    from src.syncf import tar_gz_files
+    
     print_step(1, "Testing basic packaging")
     
-    # Save current directory
-    original_cwd = os.getcwd()
-    try:
-        # Change to test directory
-        os.chdir(base_dir)
-        
-        # Create list of files to package
-        files_to_package = [
-            "main.py",
-            "config.yaml",
-            "README.md",
-            "src/",
-            "docs/",
-        ]
-        
-        print(f"Packaging {len(files_to_package)} files/directories...")
-        success = tar_gz_files(files_to_package, test_name, verbose=True)
-        
-        if success:
-            print("✓ Basic packaging test passed")
-        else:
-            print("✗ Basic packaging test failed")
-        
-        return success
-    finally:
-        # Restore original directory
-        os.chdir(original_cwd)
+    # Create list of files to package
+    files_to_package = [
+        "main.py",
+        "config.yaml",
+        "README.md",
+        "src/",
+        "docs/",
+    ]
+    
+    print(f"Packaging {len(files_to_package)} files/directories...")
+    with _pigz_env() as pigz:
+        success = tar_gz_files(files_to_package, test_name, verbose=True, cwd=base_dir)
+    
+    if success and pigz and not _packed_by_pigz(test_name):
+        print(f"✗ Archive was not compressed by {pigz}")
+        success = False
+    
+    if success:
+        print("✓ Basic packaging test passed")
+    else:
+        print("✗ Basic packaging test failed")
+    
+    return success
 
-def test_filelist_packaging(base_dir):
+def test_filelist_packaging(base_dir, tree_map=None):
     """Test packaging with filelists"""
+    from src.syncf import package_files
+    
     print_step(2, "Testing filelist packaging")
     
-    # Save current directory
-    original_cwd = os.getcwd()
-    try:
-        # Change to test directory
-        os.chdir(base_dir)
-        
-        # List available filelists
-        filelists = []
-        for file in Path(".").glob("*.txt"):
-            if file.is_file():
-                filelists.append(str(file))
-        
-        if not filelists:
-            print("No filelists found in test directory")
-            return False
-        
-        print(f"Found {len(filelists)} filelists to test")
-        all_passed = True
-        
-        for i, filelist in enumerate(filelists[:3], 1):  # Test only first 3
-            print(f"\nTesting filelist: {filelist}")
-            success = package_files(filelist, f"test_filelist_{i}", verbose=True)
-            
-            # Special handling for empty_list.txt
-            if filelist == "empty_list.txt":
-                # For empty_list.txt, we expect it to fail (no files matched)
-                if not success:
-                    print(f"✓ Filelist packaging test passed: {filelist} (correctly handled empty filelist)")
-                else:
-                    print(f"✗ Filelist packaging test failed: {filelist} (should have failed for empty filelist)")
-                    all_passed = False
+    # List available filelists, data files like requirements.txt are not filelists
+    filelists = [name for name in _list_files(tree_map, base_dir) if name in _FILELISTS]
+    
+    if not filelists:
+        print("No filelists found in test directory")
+        return False
+    
+    print(f"Found {len(filelists)} filelists to test")
+    all_passed = True
+    
+    for i, filelist in enumerate(filelists[:3], 1):  # Test only first 3
+        print(f"\nTesting filelist: {filelist}")
+        success = package_files(filelist, f"test_filelist_{i}", verbose=True, cwd=base_dir)
+        
+        # Special handling for empty_list.txt
+        if filelist == "empty_list.txt":
+            # For empty_list.txt, we expect it to fail (no files matched)
+            if not success:
+                print(f"✓ Filelist packaging test passed: {filelist} (correctly handled empty filelist)")
             else:
-                # For other filelists, we expect success
-                if success:
-                    print(f"✓ Filelist packaging test passed: {filelist}")
-                else:
-                    print(f"✗ Filelist packaging test failed: {filelist}")
-                    all_passed = False
-        
-        return all_passed
-    finally:
-        # Restore original directory
-        os.chdir(original_cwd)
+                print(f"✗ Filelist packaging test failed: {filelist} (should have failed for empty filelist)")
+                all_passed = False
+        else:
+            # For other filelists, we expect success
+            if success:
+                print(f"✓ Filelist packaging test passed: {filelist}")
+            else:
+                print(f"✗ Filelist packaging test failed: {filelist}")
+                all_passed = False
+    
+    return all_passed
 
 def test_list_packages():
     """Test package listing function"""
+    from src.syncf import show_package_list
+    
     print_step(3, "Testing package listing")
     
     print("Displaying available packages...")
     try:
-        result = show_package_list()
+        if not sys.stdin.isatty():
+            # Nobody can pick a package, answer the selection prompt with
+            # empty input; reaching the prompt means the table was rendered
+            import builtins
+            prompts = []
+            original_input = builtins.input
+            builtins.input = lambda msg='': prompts.append(msg) or ''
+            try:
+                show_package_list()
+            finally:
+                builtins.input = original_input
+            result = bool(prompts)
+        else:
+            result = show_package_list()
+        
         if result is not False:
             print("✓ Package listing function works")
             return True
@@ -395,10 +572,12 @@ def test_unpackaging():
 
 def test_clean_function():
     """Test cleanup function"""
+    from src.syncf import clean_all_packages
+    
     print_step(5, "Testing cleanup function")
     
     # Ask user if they want to clean
-    response = input("\nDo you want to clean all package files? (y/n): ").strip().lower()
+    response = _prompt("\nDo you want to clean all package files? (y/n): ")
     
     if response == 'y':
         try:
@@ -418,60 +597,51 @@ def test_clean_function():
 
 def test_edge_cases(base_dir):
     """Test edge cases and error handling"""
+    from src.syncf import package_files
+    
     print_step(6, "Testing edge cases")
     
-    # Save current directory
-    original_cwd = os.getcwd()
-    try:
-        # Change to test directory
-        os.chdir(base_dir)
-        
-        print("\n1. Testing with non-existent filelist...")
-        success = package_files("non_existent.txt", "edge_test_1", verbose=False)
-        if not success:
-            print("✓ Correctly handled non-existent filelist")
-        else:
-            print("✗ Should have failed with non-existent filelist")
-        
-        print("\n2. Testing empty filelist...")
-        with open("empty.txt", "w") as f:
-            f.write("# Empty filelist\n")
-        
-        success = package_files("empty.txt", "edge_test_2", verbose=False)
-        if not success:
-            print("✓ Correctly handled empty filelist")
-        else:
-            print("✗ Should have failed with empty filelist")
-        
-        print("\n3. Testing filelist with only comments...")
-        with open("only_comments.txt", "w") as f:
-            f.write("# Only comments\n# Another comment\n")
-        
-        success = package_files("only_comments.txt", "edge_test_3", verbose=False)
-        if not success:
-            print("✓ Correctly handled filelist with only comments")
-        else:
-            print("✗ Should have failed with filelist with only comments")
-        
-        return True
-    finally:
-        # Restore original directory
-        os.chdir(original_cwd)
+    # Create the edge case filelists in one batch
+    _write_files([
+        (base_dir / "empty.txt", b"# Empty filelist\n"),
+        (base_dir / "only_comments.txt", b"# Only comments\n# Another comment\n"),
+    ])
+    
+    print("\n1. Testing with non-existent filelist...")
+    success = package_files("non_existent.txt", "edge_test_1", verbose=False, cwd=base_dir)
+    if not success:
+        print("✓ Correctly handled non-existent filelist")
+    else:
+        print("✗ Should have failed with non-existent filelist")
+    
+    print("\n2. Testing empty filelist...")
+    success = package_files("empty.txt", "edge_test_2", verbose=False, cwd=base_dir)
+    if not success:
+        print("✓ Correctly handled empty filelist")
+    else:
+        print("✗ Should have failed with empty filelist")
+    
+    print("\n3. Testing filelist with only comments...")
+    success = package_files("only_comments.txt", "edge_test_3", verbose=False, cwd=base_dir)
+    if not success:
+        print("✓ Correctly handled filelist with only comments")
+    else:
+        print("✗ Should have failed with filelist with only comments")
+    
+    return True
 
 def test_specific_packaging_scenarios(base_dir):
     """Test specific packaging scenarios"""
+    from src.syncf import tar_gz_files
+    
     print_step(7, "Testing specific packaging scenarios")
     
-    # Save current directory
-    original_cwd = os.getcwd()
-    try:
-        # Change to test directory
-        os.chdir(base_dir)
-        
+    # Compress through pigz when it is installed
+    with _pigz_env() as pigz:
         # Test 1: Package single file
         print("\n1. Testing single file packaging...")
         files = ["main.py"]
-        success = tar_gz_files(files, "single_file_test", verbose=True)
+        success = tar_gz_files(files, "single_file_test", verbose=True, cwd=base_dir)
         if success:
             print("✓ Single file packaging test passed")
         else:
@@ -480,7 +650,7 @@ def test_specific_packaging_scenarios(base_dir):
         # Test 2: Package directory with trailing slash
         print("\n2. Testing directory packaging (with trailing slash)...")
         files = ["src/"]
-        success = tar_gz_files(files, "directory_test", verbose=True)
+        success = tar_gz_files(files, "directory_test", verbose=True, cwd=base_dir)
         if success:
             print("✓ Directory packaging test passed")
         else:
@@ -489,18 +659,88 @@ def test_specific_packaging_scenarios(base_dir):
         # Test 3: Package non-existent file
         print("\n3. Testing packaging with non-existent file...")
         files = ["main.py", "non_existent.txt", "src/"]
-        success = tar_gz_files(files, "mixed_test", verbose=True)
+        success = tar_gz_files(files, "mixed_test", verbose=True, cwd=base_dir)
         if success:
             print("✓ Mixed file list packaging test passed")
         else:
             print("✗ Mixed file list packaging test failed")
-        
-        return True
-    finally:
-        # Restore original directory
-        os.chdir(original_cwd)
+    
+    # Test 4: The pigz backend was used
+    if pigz:
+        print(f"\n4. Checking archives were compressed by {pigz}...")
+        if _packed_by_pigz("single_file_test"):
+            print("✓ pigz compression test passed")
+        else:
+            print("✗ pigz compression test failed")
+            return False
+    
+    return True
+
+def test_scan_cache(base_dir):
+    """Test scan cache hits and invalidation"""
+    from src.syncf import package_files, scan_cache_dir, scan_cache_key, filelist_stamp, load_scan_cache
+    
+    print_step(8, "Testing scan cache")
+    
+    tree = (base_dir / "cache_tree").resolve()
+    filelist = tree / "cache_list.txt"
+    os.makedirs(tree / "src", exist_ok=True)
+    _write_files([
+        (tree / "main.py", b"main\n"),
+        (tree / "src" / "module.py", b"module\n"),
+        (filelist, b"*.py\n"),
+    ])
+    
+    def age(*paths):
+        # The cache ignores anything touched within the last 2 seconds
+        old = datetime.now().timestamp() - 60
+        for path in paths:
+            os.utime(path, (old, old))
+    
+    def cached():
+        key = scan_cache_key(tree, str(filelist))
+        return load_scan_cache(tree, key, filelist_stamp(filelist))
+    
+    def cache_files():
+        return len(os.listdir(scan_cache_dir)) if scan_cache_dir.exists() else 0
+    
+    all_passed = True
+    
+    def check(ok, description):
+        nonlocal all_passed
+        if ok:
+            print(f"✓ {description}")
+        else:
+            print(f"✗ {description}")
+            all_passed = False
+    
+    print("\n1. Testing cache hit...")
+    age(tree, tree / "src", filelist)
+    package_files("cache_list.txt", "cache_test", cwd=tree)
+    entries = cache_files()
+    result = cached()
+    check(result is not None and sorted(result) == ["main.py", "src/module.py"],
+          "Unchanged tree and filelist reuse the cached walk")
+    
+    print("\n2. Testing invalidation on added file...")
+    _write_files([(tree / "src" / "extra.py", b"extra\n")])
+    check(cached() is None, "Adding a file invalidates the cache")
+    age(tree / "src")
+    package_files("cache_list.txt", "cache_test", cwd=tree)
+    result = cached()
+    check(result is not None and "src/extra.py" in result, "Rescan picks up the added file")
+    
+    print("\n3. Testing invalidation on edited filelist...")
+    _write_files([(filelist, b"*.py\n!src/\n")])
+    age(filelist)
+    check(cached() is None, "Editing the filelist invalidates the cache")
+    package_files("cache_list.txt", "cache_test", cwd=tree)
+    check(cached() == ["main.py"], "Rescan applies the edited rules")
+    check(cache_files() == entries, "Cache entry is rewritten, not duplicated")
+    
+    return all_passed
 
-def run_manual_tests(base_dir):
+def run_manual_tests(base_dir, tree_map=None):
     """Run manual tests (recommended)"""
     print("\n" + "="*60)
     print("MANUAL TESTING GUIDE")
@@ -510,7 +750,7 @@ def run_manual_tests(base_dir):
 Some functions are interactive, manual testing is recommended:
 
 Test directory: {base_dir}
-CLI tool path: {project_root / 'src' / 'cli.py'}
+CLI tool path: {_CLI_PATH}
 
 Follow these steps:
 
@@ -518,27 +758,27 @@ Follow these steps:
    cd "{base_dir}"
 
 2. Test basic packaging:
-   python "{project_root / 'src' / 'cli.py'}" -z include_all.txt all_files -v
+   python "{_CLI_PATH}" -z include_all.txt all_files -v
 
 3. List packages:
-   python "{project_root / 'src' / 'cli.py'}" -l
+   python "{_CLI_PATH}" -l
 
 4. Test unpackaging:
-   python "{project_root / 'src' / 'cli.py'}" -u -v
+   python "{_CLI_PATH}" -u -v
 
 5. Clean packages:
-   python "{project_root / 'src' / 'cli.py'}" -c -v
+   python "{_CLI_PATH}" -c -v
 
 6. Test complex rules:
-   python "{project_root / 'src' / 'cli.py'}" -z complex_rules.txt complex_test -v
+   python "{_CLI_PATH}" -z complex_rules.txt complex_test -v
 """
     print(instructions)
     
     # Show available filelists
     print("\nAvailable filelist files:")
-    for file in base_dir.glob("*.txt"):
-        if file.is_file():
-            print(f"  - {file.name}")
+    for name in _list_files(tree_map, base_dir):
+        if name in _FILELISTS:
+            print(f"  - {name}")
 
 def main():
     """Main test function"""
@@ -553,15 +793,14 @@ def main():
     # Clean old test data
     if test_dir.exists() and test_dir.is_dir():
         print(f"Cleaning old test data: {test_dir}")
-        shutil.rmtree(test_dir, ignore_errors=True)
-        time.sleep(1)  # Wait for cleanup
+        _fast_rmtree(test_dir)
     
     test_dir.mkdir(exist_ok=True)
     print(f"Test directory: {test_dir}")
     
     try:
         # 1. Setup test environment
-        setup_test_environment(test_dir)
+        tree_map = setup_test_environment(test_dir)
         
         # 2. Run automated tests
         print("\n" + "="*60)
@@ -570,9 +809,10 @@ def main():
         
         tests = [
             ("Basic packaging", lambda: test_basic_packaging(test_dir)),
-            ("Filelist packaging", lambda: test_filelist_packaging(test_dir)),
+            ("Filelist packaging", lambda: test_filelist_packaging(test_dir, tree_map)),
             ("Specific scenarios", lambda: test_specific_packaging_scenarios(test_dir)),
             ("Edge cases", lambda: test_edge_cases(test_dir)),
+            ("Scan cache", lambda: test_scan_cache(test_dir)),
             ("List packages", test_list_packages),
             ("Unpackaging", test_unpackaging),
             ("Cleanup", test_clean_function),
@@ -610,15 +850,15 @@ def main():
             print(f"\n⚠️  {failed} tests failed")
         
         # 4. Show manual testing guide
-        run_manual_tests(test_dir)
+        run_manual_tests(test_dir, tree_map)
         
         # 5. Ask about cleanup
         print("\n" + "="*60)
-        response = input("Testing complete. Clean test data? (y/N): ").strip().lower()
+        response = _prompt("Testing complete. Clean test data? (y/N): ")
         
         if response == 'y':
             print(f"Cleaning test data: {test_dir}")
-            shutil.rmtree(test_dir, ignore_errors=True)
+            _fast_rmtree(test_dir)
             print("Test data cleaned")
         else:
             print(f"Test data preserved at: {test_dir}")
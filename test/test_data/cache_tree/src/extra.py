@@ -0,0 +1 @@
+extra
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Test main program
+"""
+import sys
+from pathlib import Path
+
+def main():
+    print("Hello from main.py!")
+    print(f"Current directory: {Path.cwd()}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
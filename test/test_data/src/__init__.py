@@ -0,0 +1,8 @@
+"""Test Python file: src/__init__.py"""
+import os
+
+def test_function():
+    return "Hello from src/__init__.py"
+
+if __name__ == "__main__":
+    print(test_function())
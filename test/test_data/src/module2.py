@@ -0,0 +1,8 @@
+"""Test Python file: src/module2.py"""
+import os
+
+def test_function():
+    return "Hello from src/module2.py"
+
+if __name__ == "__main__":
+    print(test_function())
@@ -0,0 +1,8 @@
+"""Test Python file: src/tests/test_basic.py"""
+import os
+
+def test_function():
+    return "Hello from src/tests/test_basic.py"
+
+if __name__ == "__main__":
+    print(test_function())
@@ -0,0 +1,8 @@
+"""Test Python file: src/utils/helpers.py"""
+import os
+
+def test_function():
+    return "Hello from src/utils/helpers.py"
+
+if __name__ == "__main__":
+    print(test_function())
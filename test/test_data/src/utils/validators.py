@@ -0,0 +1,8 @@
+"""Test Python file: src/utils/validators.py"""
+import os
+
+def test_function():
+    return "Hello from src/utils/validators.py"
+
+if __name__ == "__main__":
+    print(test_function())